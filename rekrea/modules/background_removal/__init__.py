@@ -1,13 +1,21 @@
 from .remover import (
+    MODEL_CONFIGS,
+    PRECISIONS,
+    create_session,
     extract_frames,
     process_video,
     rebuild_video,
     remove_background_from_frames,
+    remove_background_from_stream,
 )
 
 __all__ = [
+    "MODEL_CONFIGS",
+    "PRECISIONS",
+    "create_session",
     "extract_frames",
     "process_video",
     "rebuild_video",
     "remove_background_from_frames",
+    "remove_background_from_stream",
 ]
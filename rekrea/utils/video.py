@@ -15,24 +15,59 @@ Functions
 ---------
 get_video_info    — probe video metadata including VFR/CFR detection
 extract_frames    — decode a video into individual PNG frames
-rebuild_video     — reassemble PNG frames into an H.264 MP4
+rebuild_video     — reassemble PNG frames into an H.264 MP4 (or VP9 WebM with alpha)
+count_frames      — count the PNG frames in a directory with one scan
+read_raw_frames   — stream decoded RGB frames from FFmpeg as NumPy arrays
+write_raw_frames  — stream RGBA NumPy arrays into an H.264 MP4 (or VP9 WebM) encoder
+prefetch          — run a frame iterator in a background thread (bounded queue)
 mux_audio         — attach an audio track from a source video to a silent video
 downscale_frames  — batch-downscale frames using the Lanczos filter
+nvenc_available   — check whether NVENC hardware encoding can be used
+nvdec_available   — check whether NVDEC hardware decoding can be used
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional, TypeVar
+import functools
+import os
+import queue
+import subprocess
+import tempfile
+import threading
 
 import ffmpeg
+import numpy as np
+
+T = TypeVar("T")
+
+# Shortest segment worth a separate FFmpeg process in extract_frames
+_MIN_SEGMENT_FRAMES = 50
+
+# PNG encoder options for extracted frames. PNG is lossless, so only speed
+# is traded: zlib level 1 and no row filtering (the slowest encode stage)
+# make larger but much cheaper intermediates. ``qscale`` is deliberately
+# absent — it only affects lossy codecs.
+_PNG_OUTPUT_ARGS = {"pix_fmt": "rgb24", "compression_level": 1, "pred": "none"}
 
 
 # ---------------------------------------------------------------------------
 # Metadata
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=8)
+def _probe(path: str, mtime_ns: int) -> dict:
+    """Run ffprobe on *path*; cached, with *mtime_ns* invalidating edits."""
+    return ffmpeg.probe(path)
+
+
 def get_video_info(video_path: Path) -> dict:
     """Probe *video_path* and return a dict of video metadata.
 
+    The underlying ``ffprobe`` call is cached per file (and invalidated if
+    the file is modified), so pipeline stages can each ask for the
+    metadata they need without spawning another subprocess.
+
     Compares the declared frame rate (``r_frame_rate``) with the average
     frame rate (``avg_frame_rate``) to detect Variable Frame Rate (VFR)
     content. A discrepancy greater than 1 % flags VFR.
@@ -55,8 +90,14 @@ def get_video_info(video_path: Path) -> dict:
     * ``avg_framerate`` – average frame rate (``avg_frame_rate``), float.
     * ``vfr_suspected`` – True if the two rates differ by more than 1 %.
     * ``cfr`` – the confirmed constant frame rate, or None if VFR suspected.
+    * ``width`` / ``height`` – display size in pixels, after any rotation
+      metadata has been applied (this is the size FFmpeg decodes to).
+    * ``nb_frames`` – frame count. Taken from the container when declared,
+      otherwise estimated from the duration, so treat it as a hint.
+    * ``codec`` – video codec name, e.g. ``"h264"`` or ``"hevc"``.
+    * ``pix_fmt`` – decoded pixel format, e.g. ``"yuv420p"``.
     """
-    probe = ffmpeg.probe(str(video_path))
+    probe = _probe(str(video_path), os.stat(video_path).st_mtime_ns)
     stream = next(s for s in probe["streams"] if s["codec_type"] == "video")
 
     def _parse(rate_str: str) -> float:
@@ -67,11 +108,164 @@ def get_video_info(video_path: Path) -> dict:
     avg_framerate = _parse(stream.get("avg_frame_rate") or stream["r_frame_rate"])
     vfr_suspected = abs(framerate - avg_framerate) / max(framerate, 1) > 0.01
 
+    # FFmpeg auto-rotates on decode, so portrait phone footage stored as
+    # landscape + 90° rotation comes out with width and height swapped
+    width, height = int(stream["width"]), int(stream["height"])
+    rotation = stream.get("tags", {}).get("rotate") or next(
+        (d.get("rotation") for d in stream.get("side_data_list", []) if "rotation" in d),
+        0,
+    )
+    if int(float(rotation)) % 180:
+        width, height = height, width
+
+    duration = float(stream.get("duration") or probe["format"].get("duration") or 0)
+    nb_frames = int(stream.get("nb_frames") or round(duration * avg_framerate))
+
     return {
         "framerate": framerate,
         "avg_framerate": avg_framerate,
         "vfr_suspected": vfr_suspected,
         "cfr": None if vfr_suspected else framerate,
+        "width": width,
+        "height": height,
+        "nb_frames": nb_frames,
+        "codec": stream["codec_name"],
+        "pix_fmt": stream.get("pix_fmt"),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Hardware acceleration
+# ---------------------------------------------------------------------------
+
+# x264 preset names mapped onto NVENC's p1 (fastest) … p7 (best quality) scale
+_NVENC_PRESETS = {
+    "ultrafast": "p1",
+    "superfast": "p1",
+    "veryfast": "p2",
+    "faster": "p3",
+    "fast": "p3",
+    "medium": "p4",
+    "slow": "p5",
+    "slower": "p6",
+    "veryslow": "p7",
+}
+
+# h264_nvenc rejects frames wider or taller than this
+_NVENC_MAX_DIM = 4096
+
+
+@functools.lru_cache(maxsize=None)
+def nvenc_available() -> bool:
+    """Return True if FFmpeg can encode with NVENC (``h264_nvenc``) here.
+
+    An FFmpeg build may list ``h264_nvenc`` even on machines without an
+    NVIDIA GPU or driver, so this encodes a single test frame instead of
+    parsing ``ffmpeg -encoders``. The result is cached for the process.
+    """
+    try:
+        (
+            ffmpeg
+            .input("color=black:s=256x256", format="lavfi")
+            .output("-", format="null", vcodec="h264_nvenc", vframes=1)
+            .run(quiet=True)
+        )
+    except ffmpeg.Error:
+        return False
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def nvdec_available() -> bool:
+    """Return True if FFmpeg can open a CUDA device for NVDEC decoding.
+
+    FFmpeg aborts, rather than falling back, when ``-hwaccel cuda`` is
+    requested but no CUDA device can be created, so this is checked once
+    up front. The result is cached for the process.
+    """
+    try:
+        (
+            ffmpeg
+            .input("color=black:s=256x256", format="lavfi")
+            .output("-", format="null", vframes=1)
+            .global_args("-init_hw_device", "cuda")
+            .run(quiet=True)
+        )
+    except ffmpeg.Error:
+        return False
+    return True
+
+
+def _decode_args(hwaccel: bool) -> dict:
+    """Input options for decoding, optionally on NVDEC.
+
+    ``-hwaccel cuda`` without ``-hwaccel_output_format`` downloads decoded
+    frames back to system memory, so the rest of the filter chain (pixel
+    format conversion, PNG/raw output) is unchanged. Once a CUDA device
+    exists, FFmpeg falls back to software decoding by itself for codecs or
+    profiles NVDEC does not support.
+    """
+    return {"hwaccel": "cuda"} if hwaccel and nvdec_available() else {}
+
+
+def _h264_args(
+    crf: int,
+    preset: str,
+    hwaccel: bool,
+    size: Optional[tuple] = None,
+) -> dict:
+    """Output options for H.264 encoding on NVENC, or libx264 as fallback.
+
+    NVENC's constant-quality mode (``rc=vbr`` with ``cq`` and no bitrate
+    cap) is the closest equivalent of x264's CRF, so *crf* is reused as
+    the ``cq`` value. Frames larger than NVENC supports (*size* is
+    ``(width, height)``, when known) always go to libx264.
+    """
+    fits_nvenc = size is None or max(size) <= _NVENC_MAX_DIM
+    if hwaccel and fits_nvenc and nvenc_available():
+        return {
+            "vcodec": "h264_nvenc",
+            "preset": _NVENC_PRESETS.get(preset, "p4"),
+            "tune": "hq",
+            "rc": "vbr",
+            "cq": crf,
+            "b:v": 0,
+        }
+    return {"vcodec": "libx264", "crf": crf, "preset": preset}
+
+
+def _encode_args(
+    output_path: Path,
+    crf: int,
+    preset: str,
+    hwaccel: bool,
+    preserve_alpha: bool,
+    size: Optional[tuple] = None,
+) -> tuple:
+    """Return ``(output_path, output_options)`` for the requested encoder.
+
+    With *preserve_alpha*, the output switches to VP9 in WebM with a
+    ``yuva420p`` pixel format — one of the few widely supported codecs
+    that carries an alpha channel — and the path's suffix becomes
+    ``.webm``. VP9's CRF (0–63) needs ``b:v=0`` to act as pure constant
+    quality; ``row-mt`` spreads encoding across all cores, and
+    ``auto-alt-ref`` must be off for alpha encoding. NVENC has no VP9
+    encoder, so *hwaccel* only applies to H.264.
+    """
+    if preserve_alpha:
+        return output_path.with_suffix(".webm"), {
+            "vcodec": "libvpx-vp9",
+            "pix_fmt": "yuva420p",
+            "crf": crf,
+            "b:v": 0,
+            "auto-alt-ref": 0,
+            "row-mt": 1,
+            "cpu-used": 4,
+        }
+    return output_path, {
+        "pix_fmt": "yuv420p",
+        "movflags": "+faststart",
+        **_h264_args(crf, preset, hwaccel, size),
     }
 
 
@@ -79,19 +273,67 @@ def get_video_info(video_path: Path) -> dict:
 # Frame extraction and reassembly
 # ---------------------------------------------------------------------------
 
-def extract_frames(video_path: Path, frames_dir: Path) -> float:
+def _extract_segment(
+    video_path: Path,
+    frames_dir: Path,
+    start: int,
+    count: Optional[int],
+    framerate: float,
+) -> None:
+    """Extract frames ``start`` … ``start + count - 1`` (0-based) of *video_path*.
+
+    Output files keep their global numbering (``start_number``). The seek
+    target sits half a frame before the first wanted frame so rounding in
+    the timestamps cannot drop or duplicate a frame at the boundary.
+    ``count=None`` extracts everything up to the end of the stream.
+    """
+    input_args = {"ss": (start - 0.5) / framerate} if start else {}
+    output_args = {"vframes": count} if count is not None else {}
+    (
+        ffmpeg
+        .input(str(video_path), **input_args)
+        .output(
+            str(frames_dir / "frame_%05d.png"),
+            start_number=start + 1,
+            **_PNG_OUTPUT_ARGS,
+            **output_args,
+        )
+        .global_args("-vsync", "0")
+        .overwrite_output()
+        .run(quiet=True)
+    )
+
+
+def extract_frames(
+    video_path: Path,
+    frames_dir: Path,
+    hwaccel: bool = True,
+    workers: Optional[int] = None,
+) -> float:
     """Decode *video_path* into individual PNG frames saved in *frames_dir*.
 
     Frames are named ``frame_00001.png``, ``frame_00002.png``, … to
     preserve display order. The ``-vsync 0`` flag ensures one output file
     per decoded frame, which matters for variable-fps containers.
 
+    When decoding in software, the PNG encoder is single-threaded and
+    becomes the bottleneck, so constant-frame-rate videos are split into
+    up to *workers* contiguous segments, each extracted by its own FFmpeg
+    process into its slice of the frame numbering. VFR videos, short clips
+    and NVDEC decoding use a single process.
+
     Parameters
     ----------
     video_path:
         Source video file.
     frames_dir:
         Output directory. Created if it does not exist.
+    hwaccel:
+        Decode on the GPU (NVDEC) when available. Falls back to software
+        decoding automatically.
+    workers:
+        Maximum number of parallel FFmpeg processes for software decoding.
+        Defaults to the number of CPU cores.
 
     Returns
     -------
@@ -101,30 +343,67 @@ def extract_frames(video_path: Path, frames_dir: Path) -> float:
     """
     frames_dir.mkdir(parents=True, exist_ok=True)
     info = get_video_info(video_path)
-    (
-        ffmpeg
-        .input(str(video_path))
-        .output(str(frames_dir / "frame_%05d.png"), pix_fmt="rgb24", qscale=1)
-        .global_args("-vsync", "0")
-        .overwrite_output()
-        .run(quiet=True)
-    )
+    decode_args = _decode_args(hwaccel)
+    segments = min(workers or os.cpu_count() or 1, info["nb_frames"] // _MIN_SEGMENT_FRAMES)
+
+    if decode_args or info["vfr_suspected"] or segments < 2:
+        (
+            ffmpeg
+            .input(str(video_path), **decode_args)
+            .output(str(frames_dir / "frame_%05d.png"), **_PNG_OUTPUT_ARGS)
+            .global_args("-vsync", "0")
+            .overwrite_output()
+            .run(quiet=True)
+        )
+        return info["framerate"]
+
+    per_segment = -(-info["nb_frames"] // segments)
+    starts = [k * per_segment for k in range(segments)]
+    # The last segment runs to the end, in case nb_frames was an estimate
+    counts = [per_segment] * (segments - 1) + [None]
+    with ThreadPoolExecutor(segments) as pool:
+        # Threads suffice: each one just waits on its FFmpeg subprocess
+        list(pool.map(
+            lambda start, count: _extract_segment(
+                video_path, frames_dir, start, count, info["framerate"]
+            ),
+            starts,
+            counts,
+        ))
     return info["framerate"]
 
 
+def count_frames(frames_dir: Path) -> int:
+    """Count the ``frame_*.png`` files in *frames_dir* with one directory scan.
+
+    Frames written by :func:`extract_frames` are numbered contiguously from
+    1, so callers can rebuild every path as ``frame_{i:05d}.png`` for
+    ``i`` in ``1 … count`` rather than listing, sorting and stat-ing the
+    directory. ``os.scandir`` reads names without a ``stat`` per entry on
+    most filesystems.
+    """
+    with os.scandir(frames_dir) as entries:
+        return sum(
+            1 for entry in entries
+            if entry.name.startswith("frame_") and entry.name.endswith(".png")
+        )
+
+
 def rebuild_video(
     frames_dir: Path,
     output_path: Path,
     framerate: float,
     crf: int = 16,
     preset: str = "slow",
-) -> None:
+    hwaccel: bool = True,
+    preserve_alpha: bool = False,
+) -> Path:
     """Reassemble PNG frames from *frames_dir* into an H.264 MP4.
 
     ``yuv420p`` is required for H.264 compatibility. It does not carry an
     alpha channel, so any RGBA transparency in the source frames is
-    composited over black in the output. Use VP9 + WebM for transparent
-    output.
+    dropped in the output. Set *preserve_alpha* for a transparent VP9 WebM
+    instead.
 
     ``movflags=+faststart`` moves the container index to the start of the
     file so the video can begin playing while it is still downloading.
@@ -144,22 +423,285 @@ def rebuild_video(
     preset:
         FFmpeg encoding preset. Slower presets produce smaller files at the
         same quality level without changing the CRF.
+    hwaccel:
+        Encode with NVENC (``h264_nvenc``) when available, which frees the
+        CPU and runs on dedicated silicon alongside CUDA inference. Falls
+        back to libx264 otherwise, and re-encodes with libx264 if NVENC
+        rejects the frames (e.g. wider or taller than 4096 px). *crf* and
+        *preset* are mapped onto the NVENC equivalents.
+    preserve_alpha:
+        Encode VP9 with a ``yuva420p`` alpha channel into a WebM file
+        (*output_path* with its suffix replaced by ``.webm``) so the
+        transparency survives. *crf* then uses VP9's 0–63 scale.
+
+    Returns
+    -------
+    Path
+        The path actually written (differs from *output_path* when
+        *preserve_alpha* changes the suffix).
     """
+    output_path, output_args = _encode_args(output_path, crf, preset, hwaccel, preserve_alpha)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    (
+
+    def encode(output_args: dict) -> None:
+        (
+            ffmpeg
+            .input(str(frames_dir / "frame_%05d.png"), framerate=framerate)
+            .output(str(output_path), **output_args)
+            .overwrite_output()
+            .run(quiet=True)
+        )
+
+    try:
+        encode(output_args)
+    except ffmpeg.Error:
+        # The frame size isn't known up front here, so NVENC limits are
+        # only discovered on failure — the frames are on disk, so retry
+        if output_args.get("vcodec") != "h264_nvenc":
+            raise
+        encode(_encode_args(output_path, crf, preset, False, preserve_alpha)[1])
+    return output_path
+
+
+# ---------------------------------------------------------------------------
+# In-memory frame streaming
+# ---------------------------------------------------------------------------
+
+def _popen(stream, pipe_stdin: bool = False, pipe_stdout: bool = False) -> tuple:
+    """Start FFmpeg for *stream* with its stderr spooled to a temporary file.
+
+    Nothing reads stderr until :func:`_finish`, so a pipe would fill up on
+    a damaged input and block FFmpeg (and with it the stdout/stdin pipe
+    the caller is waiting on). Returns ``(process, log)``.
+    """
+    log = tempfile.TemporaryFile()
+    process = subprocess.Popen(
+        stream.compile(),
+        stdin=subprocess.PIPE if pipe_stdin else None,
+        stdout=subprocess.PIPE if pipe_stdout else None,
+        stderr=log,
+    )
+    return process, log
+
+
+def _finish(process: subprocess.Popen, log) -> None:
+    """Wait for an async FFmpeg *process* and raise if it failed."""
+    process.communicate()
+    with log:
+        log.seek(0)
+        stderr = log.read()
+    if process.returncode != 0:
+        raise ffmpeg.Error("ffmpeg", None, stderr)
+
+
+def _kill(process: subprocess.Popen, log) -> None:
+    """Stop an async FFmpeg *process* without waiting for it to finish."""
+    process.kill()
+    process.communicate()
+    log.close()
+
+
+def read_raw_frames(
+    video_path: Path,
+    width: int,
+    height: int,
+    hwaccel: bool = True,
+) -> Iterator[np.ndarray]:
+    """Decode *video_path* and yield each frame as an ``(H, W, 3)`` RGB array.
+
+    Frames are piped from FFmpeg's stdout as raw ``rgb24`` bytes, so nothing
+    touches the disk and no PNG encode/decode is paid per frame. This is the
+    streaming counterpart of :func:`extract_frames`.
+
+    Parameters
+    ----------
+    video_path:
+        Source video file.
+    width, height:
+        Decoded frame size, as reported by :func:`get_video_info`.
+    hwaccel:
+        Decode on the GPU (NVDEC) when available, as in
+        :func:`extract_frames`.
+
+    Yields
+    ------
+    numpy.ndarray
+        Read-only ``uint8`` array of shape ``(height, width, 3)``.
+
+    Raises
+    ------
+    ffmpeg.Error
+        If FFmpeg exits with an error.
+    """
+    process, log = _popen(
         ffmpeg
-        .input(str(frames_dir / "frame_%05d.png"), framerate=framerate)
-        .output(
-            str(output_path),
-            vcodec="libx264",
-            crf=crf,
-            preset=preset,
-            pix_fmt="yuv420p",
-            movflags="+faststart",
+        .input(str(video_path), **_decode_args(hwaccel))
+        .output("pipe:", format="rawvideo", pix_fmt="rgb24")
+        .global_args("-vsync", "0", "-loglevel", "error"),
+        pipe_stdout=True,
+    )
+    frame_size = width * height * 3
+    try:
+        while True:
+            raw = process.stdout.read(frame_size)
+            if len(raw) < frame_size:
+                break
+            yield np.frombuffer(raw, np.uint8).reshape(height, width, 3)
+    except GeneratorExit:
+        # Consumer stopped early — don't leave FFmpeg blocked on a full pipe
+        _kill(process, log)
+        raise
+    _finish(process, log)
+
+
+def write_raw_frames(
+    frames: Iterable[np.ndarray],
+    output_path: Path,
+    width: int,
+    height: int,
+    framerate: float,
+    crf: int = 16,
+    preset: str = "slow",
+    hwaccel: bool = True,
+    preserve_alpha: bool = False,
+) -> Path:
+    """Encode ``(H, W, 4)`` RGBA arrays from *frames* into an H.264 MP4.
+
+    Frames are written to FFmpeg's stdin as raw ``rgba`` bytes as soon as
+    they are produced, so encoding overlaps with whatever generates them.
+    This is the streaming counterpart of :func:`rebuild_video` and shares
+    its encoder settings: alpha is dropped unless *preserve_alpha* selects
+    VP9 WebM output.
+
+    Parameters
+    ----------
+    frames:
+        Iterable of ``uint8`` arrays of shape ``(height, width, 4)``.
+    output_path:
+        Destination MP4 path. Parent directories are created if needed.
+    width, height:
+        Frame size in pixels.
+    framerate:
+        Frames per second of the output.
+    crf, preset, hwaccel, preserve_alpha:
+        Encoder settings, as in :func:`rebuild_video`. Frames too large
+        for NVENC are encoded with libx264.
+
+    Returns
+    -------
+    Path
+        The path actually written.
+
+    Raises
+    ------
+    ffmpeg.Error
+        If FFmpeg exits with an error. No output file is left behind when
+        encoding fails or *frames* raises.
+    """
+    output_path, output_args = _encode_args(
+        output_path, crf, preset, hwaccel, preserve_alpha, (width, height)
+    )
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    process, log = _popen(
+        ffmpeg
+        .input(
+            "pipe:",
+            format="rawvideo",
+            pix_fmt="rgba",
+            s=f"{width}x{height}",
+            framerate=framerate,
         )
-        .overwrite_output()
-        .run(quiet=True)
+        .output(str(output_path), **output_args)
+        .global_args("-loglevel", "error")
+        .overwrite_output(),
+        pipe_stdin=True,
     )
+    try:
+        try:
+            for frame in frames:
+                # Write the array's memory directly — tobytes() would copy it
+                process.stdin.write(np.ascontiguousarray(frame).data)
+        except BrokenPipeError:
+            # FFmpeg died — fall through so its stderr is reported below
+            pass
+        except BaseException:
+            _kill(process, log)
+            raise
+        # communicate() closes stdin, signalling end-of-stream to the encoder
+        _finish(process, log)
+    except BaseException:
+        # Don't leave a truncated video behind
+        output_path.unlink(missing_ok=True)
+        raise
+    return output_path
+
+
+def prefetch(items: Iterable[T], maxsize: int = 8) -> Iterator[T]:
+    """Iterate *items* in a background thread, buffering up to *maxsize*.
+
+    Chaining ``prefetch`` between streaming stages (decode → inference →
+    encode) lets each stage run concurrently, so total wall time
+    approaches that of the slowest stage rather than the sum of all of
+    them. The bounded queue applies backpressure: a fast producer blocks
+    once *maxsize* items are waiting, which caps memory use.
+
+    Exceptions raised while producing are re-raised in the consuming
+    thread. If the consumer stops early, the producer is stopped and
+    *items* is closed (e.g. killing an FFmpeg subprocess) in its own thread.
+
+    Parameters
+    ----------
+    items:
+        Iterable to consume in the background, typically a generator such
+        as :func:`read_raw_frames`.
+    maxsize:
+        Maximum number of items buffered ahead of the consumer.
+
+    Yields
+    ------
+    The items of *items*, in order.
+    """
+    done = object()
+    buffer: "queue.Queue[tuple]" = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(entry: tuple) -> bool:
+        # Poll so a stopped consumer can't leave the producer blocked forever
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put((item, None)):
+                    break
+            else:
+                put((done, None))
+        except BaseException as exc:
+            put((done, exc))
+        finally:
+            close = getattr(items, "close", None)
+            if close:
+                close()
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, exc = buffer.get()
+            if exc is not None:
+                raise exc
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+        thread.join()
 
 
 # ---------------------------------------------------------------------------
@@ -12,7 +12,7 @@ Usage
 
 Requirements
 ------------
-    pip install rembg ffmpeg-python onnxruntime tqdm
+    pip install rembg ffmpeg-python onnxruntime opencv-python-headless tqdm
     # ffmpeg must be installed on the system (apt install ffmpeg / winget install ffmpeg)
 """
 
@@ -128,16 +128,19 @@ def main() -> None:
     thread.start()
 
     # --- Poll queue and update UI ---
+    shown_pct = -1
+
     def poll() -> None:
+        nonlocal shown_pct
+        # Many progress messages can arrive between polls at high frame
+        # rates; only the most recent one is drawn
+        latest = None
         try:
             while True:
                 msg = progress_queue.get_nowait()
 
                 if msg[0] == "progress":
-                    _, current, total = msg
-                    pct = (current / total) * 100
-                    progress_var.set(pct)
-                    status_var.set(f"Frame {current} of {total}  ({pct:.0f}%)")
+                    latest = msg
 
                 elif msg[0] == "done":
                     win.protocol("WM_DELETE_WINDOW", win.destroy)
@@ -160,6 +163,15 @@ def main() -> None:
         except queue.Empty:
             pass
 
+        if latest is not None:
+            _, current, total = latest
+            pct = (current / total) * 100
+            # Only redraw the bar when the whole-number percentage moves
+            if int(pct) != shown_pct:
+                shown_pct = int(pct)
+                progress_var.set(pct)
+            status_var.set(f"Frame {current} of {total}  ({pct:.0f}%)")
+
         root.after(100, poll)
 
     root.after(100, poll)